@@ -10,7 +10,8 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import requests
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Union
+from collections import namedtuple
 import time
 import numpy as np
 from scipy import stats
@@ -33,6 +34,75 @@ RETRY_DELAY = 1  # seconds
 # ANALYTICS HELPER FUNCTIONS
 # ============================================================================
 
+# Struct-of-arrays alternative to the API's list of race dicts for a single
+# driver. Each field is a tuple with one entry per race: grids and positions
+# hold ints (None where missing), statuses hold API status strings, points
+# hold numbers and race_names hold strings. Nothing in the app builds one yet;
+# it is an input format for callers that already hold parsed results.
+RaceBatch = namedtuple('RaceBatch', 'grids positions statuses points race_names')
+
+
+def is_valid_race_batch(batch: RaceBatch) -> bool:
+    """
+    Check that every field of a RaceBatch has one entry per race.
+    
+    Args:
+        batch: RaceBatch to check
+        
+    Returns:
+        True if all fields have the same length, False otherwise
+    """
+    return len({len(field) for field in batch}) == 1
+
+
+def count_races(race_results: Any) -> int:
+    """
+    Count races in either a list of race result dicts or a RaceBatch.
+    
+    Args:
+        race_results: List of race result dicts from API, or a RaceBatch
+        
+    Returns:
+        Number of races, or 0 for a RaceBatch with misaligned fields
+    """
+    if isinstance(race_results, RaceBatch):
+        if not is_valid_race_batch(race_results):
+            return 0
+        return len(race_results.grids)
+    return len(race_results)
+
+
+def iter_race_rows(race_results: Any):
+    """
+    Iterate over a driver's result in each race.
+    
+    Races without a result are skipped for list input, and a RaceBatch with
+    misaligned fields yields nothing.
+    
+    Args:
+        race_results: List of race result dicts from API, or a RaceBatch
+        
+    Yields:
+        (grid, position, status, points, race_name) tuples
+    """
+    if isinstance(race_results, RaceBatch):
+        if is_valid_race_batch(race_results):
+            yield from zip(*race_results)
+        return
+    
+    for race in race_results:
+        results = race.get('Results', [])
+        if results:
+            result = results[0]  # Driver's result in this race
+            yield (
+                result.get('grid', None),
+                result.get('position', None),
+                result.get('status', 'Finished'),
+                result.get('points', '0'),
+                race.get('raceName', 'Unknown')
+            )
+
+
 def safe_int(value: Any, default: int = 0) -> int:
     """
     Safely convert value to int with DNF handling.
@@ -94,8 +164,11 @@ def is_dnf(status: str) -> bool:
         status: Race status string from API
         
     Returns:
-        True if status indicates DNF, False otherwise
+        True if status indicates DNF, False otherwise (including missing status)
     """
+    if not status:
+        return False
+    
     dnf_statuses = [
         'Accident', 'Engine', 'Gearbox', 'Transmission', 'Clutch',
         'Hydraulics', 'Electrical', 'Collision', 'Spun off', 'Retired',
@@ -133,6 +206,25 @@ def safe_correlation(x: list, y: list) -> Optional[float]:
         return None
 
 
+def classify_correlation(correlation: Optional[float]) -> str:
+    """
+    Classify driver performance from a qualifying vs race correlation.
+    
+    Args:
+        correlation: Correlation coefficient (-1 to 1) or None
+        
+    Returns:
+        Classification label for the driver
+    """
+    if correlation is None:
+        return "insufficient data"
+    if correlation < -0.3:
+        return "strong race performer"
+    if correlation > 0.7:
+        return "qualifying-dependent performer"
+    return "balanced performer"
+
+
 # ============================================================================
 # DATA ACCESS LAYER (continued)
 # ============================================================================
@@ -969,39 +1061,33 @@ def calculate_analytics_performance_trends(
 
 @st.cache_data(ttl=3600)
 def calculate_analytics_consistency_score(
-    race_results: list,
+    race_results: Union[list, RaceBatch],
     min_races: int = 5
 ) -> Optional[Dict[str, float]]:
     """
     Calculate consistency metrics for a driver.
     
     Args:
-        race_results: List of race result dicts from API
+        race_results: List of race result dicts from API, or a RaceBatch
         min_races: Minimum completed races required
     
     Returns:
         Dict with keys: consistency_score (0-100), std_dev, avg_position,
         completed_races, total_races, or None if insufficient data
     """
-    if not race_results:
+    total_races = count_races(race_results)
+    if not total_races:
         return None
     
     # Extract finishing positions for completed races only
     positions = []
-    total_races = len(race_results)
     
-    for race in race_results:
-        results = race.get('Results', [])
-        if results:
-            result = results[0]
-            status = result.get('status', '')
-            position = result.get('position', 'R')
-            
-            # Only include finished races (exclude DNFs)
-            if not is_dnf(status) and position != 'R':
-                pos_int = safe_int(position, default=None)
-                if pos_int is not None and pos_int > 0:
-                    positions.append(pos_int)
+    for _, position, status, _, _ in iter_race_rows(race_results):
+        # Only include finished races (exclude DNFs)
+        if not is_dnf(status) and position != 'R':
+            pos_int = safe_int(position, default=None)
+            if pos_int is not None and pos_int > 0:
+                positions.append(pos_int)
     
     completed_races = len(positions)
     
@@ -1141,67 +1227,70 @@ def calculate_analytics_points_per_race(
 
 @st.cache_data(ttl=3600)
 def calculate_analytics_qualifying_race_correlation(
-    race_results: list,
+    race_results: Union[list, RaceBatch],
     min_races: int = 5
 ) -> Dict[str, Any]:
     """
     Calculate correlation between qualifying and race performance.
     
     Args:
-        race_results: List of race result dicts from API
+        race_results: List of race result dicts from API, or a RaceBatch
         min_races: Minimum races required for correlation
     
     Returns:
         Dict with keys: correlation_coefficient, avg_position_change,
         classification, scatter_data (list of {grid, finish} dicts),
-        races_analyzed, missing_data_count, or None if insufficient data
+        races_analyzed, missing_data_count, or None if insufficient data.
+        scatter_data is empty whenever insufficient_data is True.
     """
-    if not race_results:
+    race_count = count_races(race_results)
+    if not race_count:
         return None
     
+    # With fewer races than min_races the result is insufficient regardless,
+    # so only count races and skip collecting positions
+    collect_positions = race_count >= min_races
+    
     # Extract grid and finish positions
     grid_positions = []
     finish_positions = []
     scatter_data = []
+    races_analyzed = 0
     missing_data_count = 0
     
-    for race in race_results:
-        results = race.get('Results', [])
-        if results:
-            result = results[0]
-            grid = result.get('grid', None)
-            position = result.get('position', None)
-            status = result.get('status', 'Finished')
-            
-            # Track races with missing qualifying or race data
-            if not grid or not position or is_dnf(status):
-                if not grid or not position:
-                    missing_data_count += 1
-                continue
-            
-            # Only include races with valid grid and finish data
-            grid_int = safe_int(grid, default=None)
-            position_int = safe_int(position, default=None)
-            
-            if grid_int is not None and position_int is not None:
+    for grid, position, status, _, race_name in iter_race_rows(race_results):
+        # Track races with missing qualifying or race data
+        is_missing = grid in (None, '') or position in (None, '')
+        if is_missing or is_dnf(status):
+            if is_missing:
+                missing_data_count += 1
+            continue
+        
+        # Only include races with valid grid and finish data
+        grid_int = safe_int(grid, default=None)
+        position_int = safe_int(position, default=None)
+        
+        if grid_int is not None and position_int is not None:
+            races_analyzed += 1
+            if collect_positions:
                 grid_positions.append(grid_int)
                 finish_positions.append(position_int)
                 scatter_data.append({
                     'grid': grid_int,
                     'finish': position_int,
-                    'race_name': race.get('raceName', 'Unknown')
+                    'race_name': race_name
                 })
-            else:
-                missing_data_count += 1
+        else:
+            missing_data_count += 1
     
     # Check if we have enough data
-    if len(grid_positions) < min_races:
+    if races_analyzed < min_races:
         return {
             'correlation_coefficient': None,
             'avg_position_change': 0.0,
             'classification': 'insufficient data',
-            'scatter_data': scatter_data,
-            'races_analyzed': len(grid_positions),
+            'scatter_data': [],
+            'races_analyzed': races_analyzed,
             'missing_data_count': missing_data_count,
             'insufficient_data': True
         }
@@ -1214,21 +1303,93 @@ def calculate_analytics_qualifying_race_correlation(
     avg_position_change = sum(position_changes) / len(position_changes) if position_changes else 0.0
     
     # Classify driver performance based on correlation
-    if correlation is None:
-        classification = "insufficient data"
-    elif correlation < -0.3:
-        classification = "strong race performer"
-    elif correlation > 0.7:
-        classification = "qualifying-dependent performer"
-    else:
-        classification = "balanced performer"
+    classification = classify_correlation(correlation)
     
     return {
         'correlation_coefficient': round(correlation, 3) if correlation is not None else None,
         'avg_position_change': round(avg_position_change, 2),
         'classification': classification,
         'scatter_data': scatter_data,
-        'races_analyzed': len(grid_positions),
+        'races_analyzed': races_analyzed,
+        'missing_data_count': missing_data_count,
+        'insufficient_data': False
+    }
+
+
+def calculate_analytics_qualifying_race_correlation_np(
+    grids: np.ndarray,
+    positions: np.ndarray,
+    min_races: int = 5,
+    race_names: Optional[list] = None
+) -> Dict[str, Any]:
+    """
+    Calculate qualifying vs race correlation from pre-parsed position arrays.
+    
+    Vectorized counterpart of calculate_analytics_qualifying_race_correlation()
+    for callers that already hold integer grid and finish positions. DNF races
+    should be dropped by the caller beforehand.
+    
+    Args:
+        grids: Grid positions per race, negative where data is missing
+        positions: Finishing positions per race, negative where data is missing
+        min_races: Minimum races required for correlation
+        race_names: Optional race names aligned with the arrays
+    
+    Returns:
+        Dict with the same keys as calculate_analytics_qualifying_race_correlation(),
+        or None if no races were given or the inputs differ in length
+    """
+    grids = np.asarray(grids, dtype=np.int64)
+    positions = np.asarray(positions, dtype=np.int64)
+    if grids.size == 0:
+        return None
+    
+    if grids.shape != positions.shape:
+        return None
+    
+    if race_names is not None and len(race_names) != grids.size:
+        return None
+    
+    # Only include races with valid grid and finish data
+    mask = (grids >= 0) & (positions >= 0)
+    valid_grids = grids[mask]
+    valid_positions = positions[mask]
+    races_analyzed = int(mask.sum())
+    missing_data_count = int(grids.size - races_analyzed)
+    
+    # Check if we have enough data
+    if races_analyzed < min_races:
+        return {
+            'correlation_coefficient': None,
+            'avg_position_change': 0.0,
+            'classification': 'insufficient data',
+            'scatter_data': [],
+            'races_analyzed': races_analyzed,
+            'missing_data_count': missing_data_count,
+            'insufficient_data': True
+        }
+    
+    if race_names is None:
+        valid_names = ['Unknown'] * races_analyzed
+    else:
+        valid_names = [name for name, keep in zip(race_names, mask) if keep]
+    
+    scatter_data = [
+        {'grid': grid, 'finish': finish, 'race_name': name}
+        for grid, finish, name in zip(valid_grids.tolist(), valid_positions.tolist(), valid_names)
+    ]
+    
+    correlation = safe_correlation(valid_grids, valid_positions)
+    
+    # Average position change (negative = gained positions)
+    avg_position_change = float((valid_positions - valid_grids).mean())
+    
+    return {
+        'correlation_coefficient': round(correlation, 3) if correlation is not None else None,
+        'avg_position_change': round(avg_position_change, 2),
+        'classification': classify_correlation(correlation),
+        'scatter_data': scatter_data,
+        'races_analyzed': races_analyzed,
         'missing_data_count': missing_data_count,
         'insufficient_data': False
     }
@@ -1236,45 +1397,42 @@ def calculate_analytics_qualifying_race_correlation(
 
 @st.cache_data(ttl=3600)
 def calculate_analytics_form_indicator(
-    race_results: list,
+    race_results: Union[list, RaceBatch],
     n_races: int = 5
 ) -> Dict[str, Any]:
     """
     Calculate recent form indicators.
     
     Args:
-        race_results: List of race result dicts from API (most recent first)
+        race_results: List of race result dicts from API (most recent first),
+            or a RaceBatch
         n_races: Number of recent races to analyze
     
     Returns:
         Dict with keys: avg_position, total_points, trend_direction,
         trend_slope, races_analyzed
     """
-    if not race_results:
+    if not count_races(race_results):
         return None
     
     # Take only the most recent n races
-    recent_races = race_results[:n_races]
+    if isinstance(race_results, RaceBatch):
+        recent_races = RaceBatch(*(field[:n_races] for field in race_results))
+    else:
+        recent_races = race_results[:n_races]
     
     positions = []
     total_points = 0.0
     races_analyzed = 0
     
-    for race in recent_races:
-        results = race.get('Results', [])
-        if results:
-            result = results[0]
-            position = result.get('position', None)
-            points = safe_float(result.get('points', '0'), default=0.0)
-            status = result.get('status', 'Finished')
-            
-            # Only include finished races for position analysis
-            if position and not is_dnf(status):
-                position_int = safe_int(position, default=None)
-                if position_int is not None:
-                    positions.append(position_int)
-                    total_points += points
-                    races_analyzed += 1
+    for _, position, status, points, _ in iter_race_rows(recent_races):
+        # Only include finished races for position analysis
+        if position not in (None, '') and not is_dnf(status):
+            position_int = safe_int(position, default=None)
+            if position_int is not None:
+                positions.append(position_int)
+                total_points += safe_float(points, default=0.0)
+                races_analyzed += 1
     
     if not positions:
         return None
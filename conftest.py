@@ -0,0 +1,233 @@
+"""
+Shared pytest fixtures for the analytics test suite.
+
+Race-result fixtures are built once per session and frozen (tuples of
+MappingProxyType dicts) so they can be shared between tests safely.
+"""
+
+import copy
+import types
+
+import pytest
+
+
+_interned = {}
+_entries = {}
+
+
+def _frozen_row(**fields):
+    """Return a shared frozen dict for the given fields, creating it once."""
+    key = tuple(sorted(fields.items()))
+    row = _interned.get(key)
+    if row is None:
+        row = _interned[key] = types.MappingProxyType(fields)
+    return row
+
+
+def _res(grid=None, position=None, status='Finished', points='0', race_name=None):
+    """Build a frozen single-driver race entry in the API's result shape."""
+    result = _frozen_row(grid=grid, position=position, status=status, points=points)
+    # Interned rows live for the whole session, so their identity is a stable key
+    key = (id(result), race_name)
+    entry = _entries.get(key)
+    if entry is None:
+        race = {'Results': (result,)}
+        if race_name is not None:
+            race['raceName'] = race_name
+        entry = _entries[key] = types.MappingProxyType(race)
+    return entry
+
+
+def _races(*entries):
+    """Freeze a sequence of race entries into a tuple."""
+    return tuple(entries)
+
+
+@pytest.fixture(scope="session")
+def _warmup():
+    """
+    Call each analytics function once so first-call setup is paid up front.
+
+    Opt-in per test module with pytest.mark.usefixtures("_warmup"). It
+    imports app when the first test using it is set up, so modules that
+    import app lazily still skip that import during collection.
+    """
+    from app import (
+        calculate_analytics_consistency_score,
+        calculate_analytics_form_indicator,
+        calculate_analytics_performance_trends,
+        calculate_analytics_qualifying_race_correlation,
+    )
+
+    tiny = _races(*(_res(grid=str(n), position=str(n), points='25') for n in range(1, 6)))
+    calculate_analytics_consistency_score(tiny, min_races=5)
+    calculate_analytics_qualifying_race_correlation(tiny, min_races=5)
+    calculate_analytics_performance_trends(tiny, metric="position")
+    calculate_analytics_form_indicator(tiny, n_races=5)
+
+
+@pytest.fixture(scope="session")
+def no_races():
+    """Empty race results."""
+    return _races()
+
+
+@pytest.fixture(scope="session")
+def finished_3():
+    """Three finished races."""
+    return _races(
+        _res(position='1', points='25'),
+        _res(position='2', points='18'),
+        _res(position='3', points='15'),
+    )
+
+
+@pytest.fixture(scope="session")
+def only_3_races():
+    """Three races, two finished and one DNF."""
+    return _races(
+        _res(position='1', points='25'),
+        _res(position='2', points='18'),
+        _res(position='R', status='Engine'),
+    )
+
+
+@pytest.fixture(scope="session")
+def all_dnfs_3():
+    """Three races, all DNFs."""
+    return _races(
+        _res(position='R', status='Engine'),
+        _res(position='R', status='Accident'),
+        _res(position='R', status='Gearbox'),
+    )
+
+
+@pytest.fixture(scope="session")
+def partial_missing_5():
+    """Five races, two missing either the grid or the finishing position."""
+    return _races(
+        _res(grid='1', position='1', race_name='Race 1'),
+        _res(grid=None, position='2', race_name='Race 2'),  # Missing qualifying data
+        _res(grid='3', position=None, race_name='Race 3'),  # Missing race result
+        _res(grid='2', position='3', race_name='Race 4'),
+        _res(grid='4', position='4', race_name='Race 5'),
+    )
+
+
+@pytest.fixture(scope="session")
+def dnf_mix_6():
+    """Six races with complete grid data, one of them a DNF."""
+    return _races(
+        _res(grid='1', position='1', race_name='Race 1'),
+        _res(grid='2', position='R', status='Engine', race_name='Race 2'),
+        _res(grid='3', position='2', race_name='Race 3'),
+        _res(grid='1', position='1', race_name='Race 4'),
+        _res(grid='2', position='3', race_name='Race 5'),
+        _res(grid='4', position='4', race_name='Race 6'),
+    )
+
+
+@pytest.fixture(scope="session")
+def all_missing_2():
+    """Two races, both missing qualifying data."""
+    return _races(
+        _res(grid=None, position='1'),
+        _res(grid=None, position='2'),
+    )
+
+
+@pytest.fixture(scope="session")
+def finished_3_batch():
+    """finished_3 as a RaceBatch."""
+    from app import RaceBatch
+
+    return RaceBatch(
+        grids=(None, None, None),
+        positions=(1, 2, 3),
+        statuses=('Finished',) * 3,
+        points=(25, 18, 15),
+        race_names=('Unknown',) * 3,
+    )
+
+
+@pytest.fixture(scope="session")
+def partial_missing_5_batch():
+    """partial_missing_5 as a RaceBatch."""
+    from app import RaceBatch
+
+    return RaceBatch(
+        grids=(1, None, 3, 2, 4),
+        positions=(1, 2, None, 3, 4),
+        statuses=('Finished',) * 5,
+        points=(0,) * 5,
+        race_names=tuple(f'Race {n}' for n in range(1, 6)),
+    )
+
+
+@pytest.fixture(scope="session")
+def dnf_mix_6_batch():
+    """
+    dnf_mix_6 as a RaceBatch.
+
+    The DNF race keeps a classified position (18) instead of the dict
+    fixture's 'R': the API reports retirements with a numeric position
+    and positionText 'R', and RaceBatch positions are ints. In both forms
+    the 'Engine' status alone is what marks the race as a DNF.
+    """
+    from app import RaceBatch
+
+    return RaceBatch(
+        grids=(1, 2, 3, 1, 2, 4),
+        positions=(1, 18, 2, 1, 3, 4),
+        statuses=('Finished', 'Engine', 'Finished', 'Finished', 'Finished', 'Finished'),
+        points=(0,) * 6,
+        race_names=tuple(f'Race {n}' for n in range(1, 7)),
+    )
+
+
+@pytest.fixture(scope="session")
+def partial_missing_5_np():
+    """partial_missing_5 as (grids, positions, race_names), -1 marking missing data."""
+    import numpy as np
+
+    return (
+        np.array([1, -1, 3, 2, 4], np.int8),
+        np.array([1, 2, -1, 3, 4], np.int8),
+        tuple(f'Race {n}' for n in range(1, 6)),
+    )
+
+
+@pytest.fixture(scope="session")
+def dnf_mix_6_np():
+    """dnf_mix_6 as (grids, positions, race_names) with the DNF race dropped."""
+    import numpy as np
+
+    return (
+        np.array([1, 3, 1, 2, 4], np.int8),
+        np.array([1, 2, 1, 3, 4], np.int8),
+        ('Race 1', 'Race 3', 'Race 4', 'Race 5', 'Race 6'),
+    )
+
+
+@pytest.fixture(scope="session")
+def cached_corr():
+    """
+    Memoized qualifying/race correlation for the session fixtures.
+
+    Keyed on the identity of the race results, which is stable because
+    the session fixtures stay alive for the whole run. Each call returns
+    its own copy, so a test that mutates its result cannot affect another.
+    """
+    from app import calculate_analytics_qualifying_race_correlation
+
+    cache = {}
+
+    def correlation(race_results, min_races=5):
+        key = (id(race_results), min_races)
+        if key not in cache:
+            cache[key] = calculate_analytics_qualifying_race_correlation(
+                race_results, min_races=min_races
+            )
+        return copy.deepcopy(cache[key])
+
+    return correlation
@@ -7,329 +7,188 @@ Tests error handling for:
 - User-friendly error messages
 """
 
+import sys
+
 import pytest
-from app import (
-    calculate_analytics_consistency_score,
-    calculate_analytics_qualifying_race_correlation,
-    calculate_analytics_performance_trends,
-    calculate_analytics_form_indicator,
-)
-
-
-def test_consistency_score_insufficient_data():
-    """Test consistency score with insufficient completed races."""
-    print("\n=== Testing Consistency Score - Insufficient Data ===")
-    
-    # Test with fewer than 5 completed races
-    race_results = [
-        {
-            'Results': [{
-                'position': '1',
-                'status': 'Finished',
-                'points': '25'
-            }]
-        },
-        {
-            'Results': [{
-                'position': '2',
-                'status': 'Finished',
-                'points': '18'
-            }]
-        },
-        {
-            'Results': [{
-                'position': 'R',
-                'status': 'Engine',
-                'points': '0'
-            }]
-        },
-    ]
-    
-    result = calculate_analytics_consistency_score(race_results, min_races=5)
+
+# The warm-up imports app when the first test here is set up, not at
+# collection time. After that, _a() below returns the cached module.
+pytestmark = pytest.mark.usefixtures("_warmup")
+
+_app = None
+
+
+def _a():
+    """Import app on first use so collecting this file does not pay for it."""
+    global _app
+    if _app is None:
+        import app
+        _app = app
+    return _app
+
+
+@pytest.mark.parametrize("races_fixture", ["only_3_races", "no_races", "all_dnfs_3"])
+def test_consistency_score_returns_none(request, races_fixture):
+    """Test consistency score returns None without enough completed races."""
+    races = request.getfixturevalue(races_fixture)
+
+    result = _a().calculate_analytics_consistency_score(races, min_races=5)
     assert result is None, "Should return None with insufficient data"
-    print("✓ Returns None when fewer than 5 completed races")
-    
-    # Test with empty race results
-    result_empty = calculate_analytics_consistency_score([], min_races=5)
-    assert result_empty is None, "Should return None with empty data"
-    print("✓ Returns None with empty race results")
-
-
-def test_correlation_missing_qualifying_data():
-    """Test correlation analysis with missing qualifying data."""
-    print("\n=== Testing Correlation - Missing Qualifying Data ===")
-    
-    # Create race results with some missing qualifying data
-    race_results = [
-        {
-            'raceName': 'Race 1',
-            'Results': [{
-                'grid': '1',
-                'position': '1',
-                'status': 'Finished'
-            }]
-        },
-        {
-            'raceName': 'Race 2',
-            'Results': [{
-                'grid': None,  # Missing qualifying data
-                'position': '2',
-                'status': 'Finished'
-            }]
-        },
-        {
-            'raceName': 'Race 3',
-            'Results': [{
-                'grid': '3',
-                'position': None,  # Missing race result
-                'status': 'Finished'
-            }]
-        },
-        {
-            'raceName': 'Race 4',
-            'Results': [{
-                'grid': '2',
-                'position': '3',
-                'status': 'Finished'
-            }]
-        },
-        {
-            'raceName': 'Race 5',
-            'Results': [{
-                'grid': '4',
-                'position': '4',
-                'status': 'Finished'
-            }]
-        },
-    ]
-    
-    result = calculate_analytics_qualifying_race_correlation(race_results, min_races=5)
-    
-    # Should return insufficient data because only 3 races have complete data
+
+
+@pytest.mark.parametrize("races_fixture,expected", [
+    # Only 3 races have complete grid and finish data
+    ("partial_missing_5", {'insufficient_data': True, 'missing_data_count': 2, 'races_analyzed': 3}),
+    # DNFs are excluded from analysis but not counted as missing data
+    ("dnf_mix_6", {'insufficient_data': False, 'missing_data_count': 0, 'races_analyzed': 5,
+                   'correlation_coefficient': 0.853, 'avg_position_change': 0.0}),
+    ("all_missing_2", {'insufficient_data': True, 'missing_data_count': 2, 'races_analyzed': 0}),
+])
+def test_correlation(request, cached_corr, races_fixture, expected):
+    """Test correlation analysis tracks missing data and excludes DNFs."""
+    races = request.getfixturevalue(races_fixture)
+
+    result = cached_corr(races, min_races=5)
+
     assert result is not None, "Should return a dict"
-    assert result.get('insufficient_data') == True, "Should flag insufficient data"
-    assert result.get('missing_data_count') == 2, "Should track 2 races with missing data"
-    assert result.get('races_analyzed') == 3, "Should only analyze 3 races with complete data"
-    
-    print(f"✓ Tracks missing data count: {result['missing_data_count']}")
-    print(f"✓ Analyzes only complete races: {result['races_analyzed']}")
-    print(f"✓ Flags insufficient data: {result['insufficient_data']}")
-
-
-def test_correlation_with_dnfs():
-    """Test correlation analysis excludes DNFs but tracks them."""
-    print("\n=== Testing Correlation - DNF Handling ===")
-    
-    race_results = [
-        {
-            'raceName': 'Race 1',
-            'Results': [{
-                'grid': '1',
-                'position': '1',
-                'status': 'Finished'
-            }]
-        },
-        {
-            'raceName': 'Race 2',
-            'Results': [{
-                'grid': '2',
-                'position': 'R',
-                'status': 'Engine'  # DNF
-            }]
-        },
-        {
-            'raceName': 'Race 3',
-            'Results': [{
-                'grid': '3',
-                'position': '2',
-                'status': 'Finished'
-            }]
-        },
-        {
-            'raceName': 'Race 4',
-            'Results': [{
-                'grid': '1',
-                'position': '1',
-                'status': 'Finished'
-            }]
-        },
-        {
-            'raceName': 'Race 5',
-            'Results': [{
-                'grid': '2',
-                'position': '3',
-                'status': 'Finished'
-            }]
-        },
-        {
-            'raceName': 'Race 6',
-            'Results': [{
-                'grid': '4',
-                'position': '4',
-                'status': 'Finished'
-            }]
-        },
-    ]
-    
-    result = calculate_analytics_qualifying_race_correlation(race_results, min_races=5)
-    
-    assert result is not None, "Should return correlation data"
-    assert result.get('insufficient_data') == False, "Should have sufficient data"
-    assert result.get('races_analyzed') == 5, "Should analyze 5 finished races (excluding 1 DNF)"
-    assert len(result.get('scatter_data', [])) == 5, "Should have 5 data points"
-    
-    print(f"✓ Excludes DNFs from analysis: {result['races_analyzed']} races analyzed")
-    print(f"✓ Has sufficient data after excluding DNFs")
+    assert result['insufficient_data'] == expected['insufficient_data']
+    assert result['missing_data_count'] == expected['missing_data_count']
+    assert result['races_analyzed'] == expected['races_analyzed']
+    for key in ('correlation_coefficient', 'avg_position_change'):
+        if key in expected:
+            assert result[key] == pytest.approx(expected[key], rel=1e-6)
+
+
+PARTIAL_MISSING_5_NAMES = ['Race 1', 'Race 4', 'Race 5']
+DNF_MIX_6_NAMES = ['Race 1', 'Race 3', 'Race 4', 'Race 5', 'Race 6']
+
+
+@pytest.mark.parametrize("races_fixture,min_races,expected", [
+    ("dnf_mix_6", 5, {'races_analyzed': 5, 'missing_data_count': 0,
+                      'race_names': ['Race 1', 'Race 3', 'Race 4', 'Race 5', 'Race 6']}),
+    # Enough races but too few usable ones: insufficient, no scatter data
+    ("partial_missing_5", 5, {'races_analyzed': 3, 'missing_data_count': 2, 'race_names': []}),
+    # Fewer races than min_races: counts are kept but no scatter data is built
+    ("partial_missing_5", 10, {'races_analyzed': 3, 'missing_data_count': 2, 'race_names': []}),
+    ("dnf_mix_6", 10, {'races_analyzed': 5, 'missing_data_count': 0, 'race_names': []}),
+    ("all_missing_2", 5, {'races_analyzed': 0, 'missing_data_count': 2, 'race_names': []}),
+])
+def test_correlation_scatter_data(request, cached_corr, races_fixture, min_races, expected):
+    """Test scatter data is only returned when there is sufficient data."""
+    races = request.getfixturevalue(races_fixture)
+
+    result = cached_corr(races, min_races=min_races)
+
+    assert result['races_analyzed'] == expected['races_analyzed']
+    assert result['missing_data_count'] == expected['missing_data_count']
+    assert [point['race_name'] for point in result['scatter_data']] == expected['race_names']
+
+
+@pytest.mark.parametrize("races_fixture,min_races", [
+    ("partial_missing_5", 5),
+    ("dnf_mix_6", 5),
+    # Fewer than min_races usable races
+    ("partial_missing_5", 10),
+    ("dnf_mix_6", 10),
+])
+def test_correlation_vectorized(request, races_fixture, min_races):
+    """Test the array-based correlation matches the dict-based one."""
+    races = request.getfixturevalue(races_fixture)
+    grids, positions, race_names = request.getfixturevalue(races_fixture + "_np")
+
+    result = _a().calculate_analytics_qualifying_race_correlation_np(
+        grids, positions, min_races=min_races, race_names=race_names
+    )
+
+    # Call the dict-based function directly rather than through cached_corr,
+    # so the comparison is against a freshly computed result
+    expected = _a().calculate_analytics_qualifying_race_correlation(races, min_races=min_races)
+    assert result == expected
+
+
+@pytest.mark.parametrize("grids,positions,race_names", [
+    ([1, 2, 3], [1, 2], None),
+    ([1, 2, 3], [1, 2, 3], ['Race 1', 'Race 2']),
+])
+def test_correlation_vectorized_mismatched_lengths(grids, positions, race_names):
+    """Test the array-based correlation returns None for misaligned inputs."""
+    result = _a().calculate_analytics_qualifying_race_correlation_np(
+        grids, positions, min_races=2, race_names=race_names
+    )
+
+    assert result is None
+
+
+@pytest.mark.parametrize("func_name,races_fixture,kwargs", [
+    ("calculate_analytics_consistency_score", "dnf_mix_6", {'min_races': 5}),
+    ("calculate_analytics_qualifying_race_correlation", "partial_missing_5", {'min_races': 5}),
+    ("calculate_analytics_qualifying_race_correlation", "dnf_mix_6", {'min_races': 5}),
+    ("calculate_analytics_form_indicator", "finished_3", {'n_races': 5}),
+    ("calculate_analytics_form_indicator", "dnf_mix_6", {'n_races': 3}),
+])
+def test_race_batch_matches_dicts(request, func_name, races_fixture, kwargs):
+    """Test analytics give the same result for a RaceBatch and race dicts."""
+    func = getattr(_a(), func_name)
+    races = request.getfixturevalue(races_fixture)
+    batch = request.getfixturevalue(races_fixture + "_batch")
+
+    assert func(batch, **kwargs) == func(races, **kwargs)
+
+
+@pytest.mark.parametrize("func_name,kwargs", [
+    ("calculate_analytics_consistency_score", {'min_races': 1}),
+    ("calculate_analytics_qualifying_race_correlation", {'min_races': 1}),
+    ("calculate_analytics_form_indicator", {'n_races': 5}),
+])
+def test_race_batch_misaligned_fields(func_name, kwargs):
+    """Test analytics return None for a RaceBatch whose fields differ in length."""
+    app = _a()
+    batch = app.RaceBatch(
+        grids=(1, 2, 3),
+        positions=(1, 2),
+        statuses=('Finished',) * 3,
+        points=(25, 18, 15),
+        race_names=('Race 1', 'Race 2', 'Race 3'),
+    )
+
+    assert getattr(app, func_name)(batch, **kwargs) is None
+
+
+def test_race_batch_missing_status():
+    """Test a missing status in a RaceBatch is not treated as a DNF."""
+    app = _a()
+    batch = app.RaceBatch(
+        grids=(1, 2, 3),
+        positions=(1, 2, 3),
+        statuses=(None, 'Finished', 'Finished'),
+        points=(25, 18, 15),
+        race_names=('Race 1', 'Race 2', 'Race 3'),
+    )
+
+    result = app.calculate_analytics_form_indicator(batch, n_races=5)
+
+    assert result['races_analyzed'] == 3
 
 
 def test_performance_trends_empty_data():
     """Test performance trends with empty data."""
-    print("\n=== Testing Performance Trends - Empty Data ===")
-    
-    result = calculate_analytics_performance_trends([], metric="position")
-    
+    result = _a().calculate_analytics_performance_trends([], metric="position")
+
     # Should return empty DataFrame or None
     assert result is None or len(result) == 0, "Should handle empty data gracefully"
-    print("✓ Handles empty data gracefully")
 
 
-def test_form_indicator_fewer_than_n_races():
+def test_form_indicator_fewer_than_n_races(finished_3):
     """Test form indicator with fewer races than requested."""
-    print("\n=== Testing Form Indicator - Fewer Races ===")
-    
     # Only 3 races available, but requesting 5
-    race_results = [
-        {
-            'Results': [{
-                'position': '1',
-                'status': 'Finished',
-                'points': '25'
-            }]
-        },
-        {
-            'Results': [{
-                'position': '2',
-                'status': 'Finished',
-                'points': '18'
-            }]
-        },
-        {
-            'Results': [{
-                'position': '3',
-                'status': 'Finished',
-                'points': '15'
-            }]
-        },
-    ]
-    
-    result = calculate_analytics_form_indicator(race_results, n_races=5)
-    
+    result = _a().calculate_analytics_form_indicator(finished_3, n_races=5)
+
     assert result is not None, "Should return form data"
     assert result.get('races_analyzed') == 3, "Should analyze all 3 available races"
-    assert 'avg_position' in result
-    assert 'total_points' in result
-    assert 'trend_direction' in result
-    
-    print(f"✓ Analyzes available races: {result['races_analyzed']}")
-    print(f"✓ Calculates trend with fewer races: {result['trend_direction']}")
-
-
-def test_correlation_all_missing_data():
-    """Test correlation when all races have missing data."""
-    print("\n=== Testing Correlation - All Missing Data ===")
-    
-    race_results = [
-        {
-            'raceName': 'Race 1',
-            'Results': [{
-                'grid': None,
-                'position': '1',
-                'status': 'Finished'
-            }]
-        },
-        {
-            'raceName': 'Race 2',
-            'Results': [{
-                'grid': None,
-                'position': '2',
-                'status': 'Finished'
-            }]
-        },
-    ]
-    
-    result = calculate_analytics_qualifying_race_correlation(race_results, min_races=5)
-    
-    assert result is not None, "Should return a dict"
-    assert result.get('insufficient_data') == True, "Should flag insufficient data"
-    assert result.get('races_analyzed') == 0, "Should have 0 races analyzed"
-    assert result.get('missing_data_count') == 2, "Should track all missing data"
-    
-    print(f"✓ Handles all missing data: {result['missing_data_count']} races with missing data")
-    print(f"✓ Flags insufficient data correctly")
-
-
-def test_consistency_score_all_dnfs():
-    """Test consistency score when all races are DNFs."""
-    print("\n=== Testing Consistency Score - All DNFs ===")
-    
-    race_results = [
-        {
-            'Results': [{
-                'position': 'R',
-                'status': 'Engine',
-                'points': '0'
-            }]
-        },
-        {
-            'Results': [{
-                'position': 'R',
-                'status': 'Accident',
-                'points': '0'
-            }]
-        },
-        {
-            'Results': [{
-                'position': 'R',
-                'status': 'Gearbox',
-                'points': '0'
-            }]
-        },
-    ]
-    
-    result = calculate_analytics_consistency_score(race_results, min_races=5)
-    
-    assert result is None, "Should return None when no completed races"
-    print("✓ Returns None when all races are DNFs")
-
-
-def run_all_tests():
-    """Run all tests."""
-    print("=" * 60)
-    print("Testing Task 3.6: Error Handling for Driver Analytics")
-    print("=" * 60)
-    
-    try:
-        test_consistency_score_insufficient_data()
-        test_correlation_missing_qualifying_data()
-        test_correlation_with_dnfs()
-        test_performance_trends_empty_data()
-        test_form_indicator_fewer_than_n_races()
-        test_correlation_all_missing_data()
-        test_consistency_score_all_dnfs()
-        
-        print("\n" + "=" * 60)
-        print("✅ ALL ERROR HANDLING TESTS PASSED!")
-        print("=" * 60)
-        return 0
-    except AssertionError as e:
-        print(f"\n❌ Test failed: {e}")
-        return 1
-    except Exception as e:
-        print(f"\n❌ Unexpected error: {e}")
-        import traceback
-        traceback.print_exc()
-        return 1
+    assert result['avg_position'] == pytest.approx(2.0, rel=1e-6)
+    assert result['total_points'] == pytest.approx(58.0, rel=1e-6)
+    assert result['trend_direction'] == "declining"
 
 
 if __name__ == "__main__":
-    exit(run_all_tests())
+    sys.exit(pytest.main([__file__, "-x", "--tb=short"]))